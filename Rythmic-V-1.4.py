@@ -1,165 +1,484 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, request, session, g, abort
 import time
-import statistics
-import json
 import os
+import sqlite3
+import threading
+import numpy as np
+import orjson
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from datetime import timedelta
 import secrets
 import hashlib
+import hmac
+import re
+from collections import OrderedDict, namedtuple
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+SECRET_KEY_FILE = '.flask_secret'
+
+def load_secret_key(path=SECRET_KEY_FILE):
+    """Reuse one session signing key across restarts and worker processes"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    
+    key = secrets.token_bytes(32)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    try:
+        # link() refuses to overwrite, so if another worker won the race use its key
+        os.link(tmp_path, path)
+    except FileExistsError:
+        with open(path, 'rb') as f:
+            key = f.read()
+    finally:
+        os.unlink(tmp_path)
+    return key
 
 app = Flask(__name__)
-app.secret_key = secrets.token_hex(32)
+app.secret_key = load_secret_key()
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(minutes=30)
+# Bound the work a single request can cause before and after parsing
+app.config['MAX_CONTENT_LENGTH'] = 64 * 1024
+MAX_TIMINGS = 512
+MAX_SAMPLES = 16
+MAX_BATCH_SIZE = 64
+
+if njit is not None:
+    @njit
+    def _distance_kernel(x, mu, sigma):
+        # Same scaled Manhattan distance as KeystrokeAuthenticator.similarity_scores
+        total = 0.0
+        for i in range(x.shape[0]):
+            total += abs(x[i] - mu[i]) / sigma[i]
+        return total / x.shape[0]
+    
+    # Compile now for the argument types used at login (read-only stored
+    # vectors from np.frombuffer) rather than on the first request
+    _distance_kernel(np.ones(2), np.frombuffer(bytes(16)), np.frombuffer(np.ones(2).tobytes()))
+else:
+    _distance_kernel = None
+
+# Cached row for one user; mu and sigma are float64 vectors, or None for
+# profiles imported from the JSON store that have no typing rhythm yet
+Profile = namedtuple('Profile', ['password_hash', 'mu', 'sigma'])
+
+# What the JSON store kept in 'password': a hex MD5 digest of the plaintext
+LEGACY_DIGEST = re.compile(r'[0-9a-f]{32}')
 
 class KeystrokeAuthenticator:
-    def __init__(self, profile_file='keystroke_profile.json'):
-        self.profile_file = profile_file
-        self.profiles = self.load_profiles()
+    __slots__ = ('db_file', '_hasher', '_lock', '_profile_cache',
+                 '_user_names', '_data_version', 'db')
+    
+    PROFILE_CACHE_SIZE = 1024
+    # Accept when the mean scaled distance D is at most MAX_DISTANCE.
+    # Tuned by simulating genuine logins against 3-sample enrolments with a
+    # 9-interval password: per-key stdevs of 20/40/80 ms give acceptance of
+    # about 100%/98%/88%. Even a genuine attempt has D near 0.8 (E|z| for
+    # a normal variable), so the cutoff has to sit well above 1.
+    MAX_DISTANCE = 2.0
+    SIMILARITY_THRESHOLD = 1.0 / (1.0 + MAX_DISTANCE)
+    # Lower bound (seconds) on a per-interval stdev so that a very
+    # consistent enrolment does not make every later attempt look distant
+    SIGMA_FLOOR = 0.02
+    
+    def __init__(self, db_file='profiles.db', legacy_file='keystroke_profile.json'):
+        self.db_file = db_file
+        self._hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+        # One connection shared by all request threads; the lock keeps their
+        # statements from interleaving inside a transaction
+        self._lock = threading.Lock()
+        # username -> Profile, or None for unknown users
+        self._profile_cache = OrderedDict()
+        self._user_names = None
+        self._data_version = None
+        self.db = sqlite3.connect(db_file, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.create_schema()
+        self.import_legacy_profiles(legacy_file)
+    
+    def create_schema(self):
+        """Create or upgrade the tables; safe when several workers start at once"""
+        # BEGIN IMMEDIATE takes the write lock up front, so only one worker
+        # at a time inspects and alters the schema
+        with self._lock, self.db:
+            self.db.execute('BEGIN IMMEDIATE')
+            self.db.execute(
+                'CREATE TABLE IF NOT EXISTS profiles ('
+                'username TEXT PRIMARY KEY, password_hash TEXT, mu BLOB, sigma BLOB, pwlen INT)'
+            )
+            # Databases created before per-interval profiles only have 'vec'
+            columns = {row[1] for row in self.db.execute('PRAGMA table_info(profiles)')}
+            if 'mu' not in columns:
+                self.db.execute('ALTER TABLE profiles ADD COLUMN mu BLOB')
+                self.db.execute('ALTER TABLE profiles ADD COLUMN sigma BLOB')
+            # One-off markers, e.g. that the legacy JSON store was imported
+            self.db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
     
     def hash_password(self, password):
-        """Hash password using MD5"""
-        return hashlib.md5(password.encode()).hexdigest()
+        """Hash password using Argon2id"""
+        return self._hasher.hash(password)
     
     def verify_password(self, password, hashed):
-        """Verify password against MD5 hash"""
-        return self.hash_password(password) == hashed
-        
-    def load_profiles(self):
-        if os.path.exists(self.profile_file):
-            with open(self.profile_file, 'r') as f:
-                return json.load(f)
-        return {}
-    
-    def save_profiles(self):
-        with open(self.profile_file, 'w') as f:
-            json.dump(self.profiles, f, indent=2)
-    
-    def calculate_timing_features(self, timings):
-        if len(timings) < 2:
+        """Verify password against an Argon2id hash or a legacy MD5 digest"""
+        if not hashed.startswith('$argon2'):
+            legacy = hashlib.md5(password.encode()).hexdigest()
+            return hmac.compare_digest(legacy, hashed)
+        try:
+            return self._hasher.verify(hashed, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    def needs_rehash(self, hashed):
+        return not hashed.startswith('$argon2') or self._hasher.check_needs_rehash(hashed)
+        
+    def import_legacy_profiles(self, profile_file):
+        """Copy profiles from the old JSON store into the database once.
+        
+        The file is left in place because the command-line tool still uses it.
+        """
+        # The first worker to get the write lock imports and sets the
+        # marker; workers starting alongside it then find the marker
+        with self._lock, self.db:
+            self.db.execute('BEGIN IMMEDIATE')
+            if self.db.execute("SELECT 1 FROM meta WHERE key = 'legacy_import'").fetchone():
+                return
+            
+            try:
+                with open(profile_file, 'rb') as f:
+                    profiles = orjson.loads(f.read())
+            except FileNotFoundError:
+                return
+            
+            # The JSON store only kept aggregate statistics, so these users
+            # keep their password but have to re-enroll their typing rhythm.
+            # Only MD5 digests can be verified here; command-line profiles hold
+            # either an scrypt hash or, from older versions, the plaintext
+            rows = []
+            skipped = []
+            for username, profile in profiles.items():
+                digest = profile.get('password')
+                if isinstance(digest, str) and LEGACY_DIGEST.fullmatch(digest):
+                    rows.append((username, digest, profile['password_length']))
+                else:
+                    skipped.append(username)
+            if skipped:
+                print(f"⚠️  Not importing {len(skipped)} profile(s) without an MD5 digest "
+                      f"({', '.join(skipped)}); they remain in {profile_file} only")
+            
+            self.db.executemany(
+                'INSERT OR IGNORE INTO profiles (username, password_hash, pwlen) VALUES (?, ?, ?)',
+                rows
+            )
+            self.db.execute(
+                "INSERT INTO meta (key, value) VALUES ('legacy_import', ?)", (profile_file,)
+            )
+    
+    def interval_vector(self, timings, length):
+        """One sample's key intervals as a vector, or None unless there are exactly length"""
+        # Intervals are compared by position, so a sample with one missing
+        # or extra interval would be scored against the wrong keys
+        if len(timings) != length:
             return None
-        
-        features = {
-            'mean': statistics.mean(timings),
-            'median': statistics.median(timings),
-            'stdev': statistics.stdev(timings) if len(timings) > 1 else 0,
-            'min': min(timings),
-            'max': max(timings),
-            'total_time': sum(timings)
-        }
-        return features
-    
-    def compare_timing_profiles(self, profile1, profile2):
-        if not profile1 or not profile2:
-            return 0
-        
-        diffs = []
-        weights = {'mean': 0.3, 'median': 0.2, 'stdev': 0.2, 'total_time': 0.3}
-        
-        for key in weights:
-            if profile1[key] == 0 and profile2[key] == 0:
-                diffs.append(0)
-            elif profile1[key] == 0 or profile2[key] == 0:
-                diffs.append(1)
-            else:
-                diff = abs(profile1[key] - profile2[key]) / max(profile1[key], profile2[key])
-                diffs.append(diff * weights[key])
-        
-        total_diff = sum(diffs)
-        similarity = 1 - total_diff
-        
-        return max(0, similarity)
+        return np.asarray(timings, dtype=np.float64)
+    
+    def compare_timing_profiles(self, mu, sigma, x):
+        """Similarity 1 / (1 + D) from the scaled Manhattan distance D"""
+        if _distance_kernel is not None:
+            distance = _distance_kernel(x, mu, sigma)
+        else:
+            distance = float(np.mean(np.abs(x - mu) / sigma))
+        return 1.0 / (1.0 + distance)
+    
+    def similarity_scores(self, profiles):
+        """Similarities for a list of (mu, sigma, x) triples scored as padded 2-D arrays"""
+        lengths = np.array([mu.size for mu, _, _ in profiles])
+        shape = (len(profiles), lengths.max())
+        # Padding cells have x == mu, so they add nothing to the distance
+        mu = np.zeros(shape)
+        sigma = np.ones(shape)
+        x = np.zeros(shape)
+        for i, (m, s, v) in enumerate(profiles):
+            mu[i, :m.size] = m
+            sigma[i, :m.size] = s
+            x[i, :m.size] = v
+        
+        distances = (np.abs(x - mu) / sigma).sum(axis=1) / lengths
+        return 1.0 / (1.0 + distances)
     
     def enroll_user(self, username, password, all_timings):
         if len(all_timings) < 3:
             return False, "Need at least 3 samples"
         
-        avg_features = {}
-        feature_keys = ['mean', 'median', 'stdev', 'min', 'max', 'total_time']
-        
-        for key in feature_keys:
-            values = []
-            for timings in all_timings:
-                features = self.calculate_timing_features(timings)
-                if features:
-                    values.append(features[key])
-            if values:
-                avg_features[key] = statistics.mean(values)
-        
-        # Hash the password before storing
-        self.profiles[username] = {
-            'password': self.hash_password(password),
-            'timing_profile': avg_features,
-            'password_length': len(password)
-        }
+        # The web client records one interval between each pair of
+        # consecutive keystrokes; the spread needs at least two of them
+        length = len(password) - 1
+        if length < 2:
+            return False, "Password must be at least 3 characters"
+        
+        # Users without a typing profile (imports and pre-interval rows,
+        # see check_attempt) may enroll again if they know the password
+        existing = self.get_profile(username)
+        if existing is not None:
+            if existing.mu is not None:
+                return False, "User already exists"
+            if not self.verify_password(password, existing.password_hash):
+                return False, "Incorrect password"
+        
+        # One row of key intervals per sample
+        rows = [self.interval_vector(timings, length) for timings in all_timings]
+        if any(row is None for row in rows):
+            return False, "Timing data does not match the password length"
+        
+        mat = np.vstack(rows)
+        mu = mat.mean(axis=0)
+        sigma = np.maximum(mat.std(axis=0, ddof=1), self.SIGMA_FLOOR)
+        
+        # Hash before taking the lock; Argon2 is deliberately slow and the
+        # lock is shared with every profile read
+        password_hash = self.hash_password(password)
+        try:
+            with self._lock, self.db:
+                if existing is None:
+                    self.db.execute(
+                        'INSERT INTO profiles (username, password_hash, mu, sigma, pwlen) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        (username, password_hash,
+                         mu.tobytes(), sigma.tobytes(), len(password))
+                    )
+                else:
+                    # Only replace the row if nobody enrolled it in the meantime
+                    cur = self.db.execute(
+                        'UPDATE profiles SET password_hash = ?, mu = ?, sigma = ?, pwlen = ? '
+                        'WHERE username = ? AND mu IS NULL',
+                        (password_hash, mu.tobytes(), sigma.tobytes(),
+                         len(password), username)
+                    )
+                    if cur.rowcount == 0:
+                        return False, "User already exists"
+                self._profile_cache.pop(username, None)
+                self._user_names = None
+        except sqlite3.IntegrityError:
+            return False, "User already exists"
         
-        self.save_profiles()
         return True, "User enrolled successfully"
     
-    def authenticate_user(self, username, password, timings):
-        if username not in self.profiles:
-            return False, "User not found", 0
+    def refresh_caches(self):
+        """Drop cached reads if another connection has committed; call with the lock held"""
+        # data_version changes when another connection (e.g. another
+        # worker process) commits, which may have touched any user
+        version = self.db.execute('PRAGMA data_version').fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            self._profile_cache.clear()
+            self._user_names = None
+    
+    def get_profile(self, username):
+        """Return a user's Profile, or None, via a small LRU cache"""
+        with self._lock:
+            self.refresh_caches()
+            
+            if username in self._profile_cache:
+                self._profile_cache.move_to_end(username)
+                return self._profile_cache[username]
+            
+            row = self.db.execute(
+                'SELECT password_hash, mu, sigma FROM profiles WHERE username = ?', (username,)
+            ).fetchone()
+            profile = None
+            if row is not None:
+                password_hash, mu, sigma = row
+                if mu is not None:
+                    mu = np.frombuffer(mu, dtype=np.float64)
+                    sigma = np.frombuffer(sigma, dtype=np.float64)
+                profile = Profile(password_hash, mu, sigma)
+            
+            self._profile_cache[username] = profile
+            if len(self._profile_cache) > self.PROFILE_CACHE_SIZE:
+                self._profile_cache.popitem(last=False)
+            return profile
+    
+    def check_attempt(self, username, password, timings):
+        """Run every check except the timing comparison.
+        
+        Returns (failure, None) when the attempt is already rejected, or
+        (None, (mu, sigma, x)) when it still needs scoring.
+        """
+        profile = self.get_profile(username)
+        if profile is None:
+            return (False, "User not found", 0), None
         
-        profile = self.profiles[username]
+        password_hash, mu, sigma = profile
         
         # Verify password using hash comparison
-        if not self.verify_password(password, profile['password']):
-            return False, "Incorrect password", 0
+        if not self.verify_password(password, password_hash):
+            return (False, "Incorrect password", 0), None
+        
+        # Upgrade legacy MD5 digests now that the plaintext is known to be right
+        if self.needs_rehash(password_hash):
+            new_hash = self.hash_password(password)
+            with self._lock, self.db:
+                self.db.execute(
+                    'UPDATE profiles SET password_hash = ? WHERE username = ?',
+                    (new_hash, username)
+                )
+                self._profile_cache.pop(username, None)
+        
+        # Profiles from before per-interval scoring have no rhythm to compare
+        if mu is None:
+            return (False, "Typing profile outdated, please enroll again with the same password", 0), None
+        
+        x = self.interval_vector(timings, mu.size)
+        if x is None:
+            return (False, "Timing data does not match the password length", 0), None
+        
+        return None, (mu, sigma, x)
+    
+    def authenticate_user(self, username, password, timings):
+        failure, vectors = self.check_attempt(username, password, timings)
+        if failure:
+            return failure
         
-        current_features = self.calculate_timing_features(timings)
-        if not current_features:
-            return False, "Insufficient timing data", 0
+        similarity = self.compare_timing_profiles(*vectors)
+        return self.verdict(similarity)
+    
+    def authenticate_batch(self, attempts):
+        """Authenticate a list of (username, password, timings) attempts together"""
+        results = [None] * len(attempts)
+        pending = []
+        profiles = []
+        
+        for i, (username, password, timings) in enumerate(attempts):
+            failure, vectors = self.check_attempt(username, password, timings)
+            if failure:
+                results[i] = failure
+            else:
+                pending.append(i)
+                profiles.append(vectors)
         
-        similarity = self.compare_timing_profiles(
-            profile['timing_profile'], 
-            current_features
-        )
+        # Score all surviving attempts as one padded 2-D array operation
+        if pending:
+            scores = self.similarity_scores(profiles)
+            for i, similarity in zip(pending, scores.tolist()):
+                results[i] = self.verdict(similarity)
         
-        if similarity >= 0.60:
+        return results
+    
+    def verdict(self, similarity):
+        if similarity >= self.SIMILARITY_THRESHOLD:
             return True, "Authentication successful", similarity
         else:
             return False, "Typing pattern mismatch", similarity
     
     def list_users(self):
-        return list(self.profiles.keys())
+        with self._lock:
+            self.refresh_caches()
+            if self._user_names is None:
+                rows = self.db.execute('SELECT username FROM profiles ORDER BY rowid').fetchall()
+                self._user_names = tuple(username for (username,) in rows)
+            return self._user_names
     
     def delete_user(self, username):
-        if username in self.profiles:
-            del self.profiles[username]
-            self.save_profiles()
-            return True
-        return False
+        with self._lock, self.db:
+            cur = self.db.execute('DELETE FROM profiles WHERE username = ?', (username,))
+            self._profile_cache.pop(username, None)
+            self._user_names = None
+        return cur.rowcount > 0
 
 auth = KeystrokeAuthenticator()
 
+def ojsonify(obj, status=200):
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
+def request_data(kind=dict):
+    """Parse the JSON request body once per request; 400 unless it is a kind"""
+    if 'json_body' not in g:
+        try:
+            g.json_body = orjson.loads(request.get_data())
+        except orjson.JSONDecodeError:
+            abort(400)
+    if not isinstance(g.json_body, kind):
+        abort(400)
+    return g.json_body
+
+def is_timings(value):
+    """True for a list of numbers, i.e. one sample's key intervals"""
+    return isinstance(value, list) and all(
+        isinstance(t, (int, float)) and not isinstance(t, bool) for t in value)
+
+def is_attempt(item):
+    """True for a well-formed [username, password, timings] login attempt"""
+    if not isinstance(item, list) or len(item) != 3:
+        return False
+    username, password, timings = item
+    return isinstance(username, str) and isinstance(password, str) and is_timings(timings)
+
+# The page reads every API response as JSON, errors included
+@app.errorhandler(400)
+def bad_request(error):
+    return ojsonify({'success': False, 'message': 'Malformed request'}, 400)
+
+@app.errorhandler(413)
+def request_too_large(error):
+    return ojsonify({'success': False, 'message': 'Request too large'}, 413)
+
+@app.after_request
+def cache_static(response):
+    # The page is a static asset; let browsers reuse it instead of re-fetching
+    if request.endpoint in ('index', 'static'):
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return app.send_static_file('index.html')
 
 @app.route('/api/enroll', methods=['POST'])
 def enroll():
-    data = request.json
+    data = request_data()
     username = data.get('username')
     password = data.get('password')
     all_timings = data.get('timings', [])
     
     if not username or not password:
-        return jsonify({'success': False, 'message': 'Username and password required'})
+        return ojsonify({'success': False, 'message': 'Username and password required'})
+    if not (isinstance(username, str) and isinstance(password, str)
+            and isinstance(all_timings, list)
+            and all(is_timings(timings) for timings in all_timings)):
+        abort(400)
     
-    if username in auth.profiles:
-        return jsonify({'success': False, 'message': 'User already exists'})
+    if len(all_timings) > MAX_SAMPLES:
+        return ojsonify({'success': False, 'message': 'Too many samples'}, 400)
+    if any(len(timings) > MAX_TIMINGS for timings in all_timings):
+        return ojsonify({'success': False, 'message': 'Too many timings'}, 400)
     
     success, message = auth.enroll_user(username, password, all_timings)
-    return jsonify({'success': success, 'message': message})
+    return ojsonify({'success': success, 'message': message})
 
 @app.route('/api/authenticate', methods=['POST'])
 def authenticate():
-    data = request.json
+    data = request_data()
     username = data.get('username')
     password = data.get('password')
     timings = data.get('timings', [])
     
     if not username or not password:
-        return jsonify({'success': False, 'message': 'Username and password required'})
+        return ojsonify({'success': False, 'message': 'Username and password required'})
+    if not is_attempt([username, password, timings]):
+        abort(400)
+    
+    if len(timings) > MAX_TIMINGS:
+        return ojsonify({'success': False, 'message': 'Too many timings'}, 400)
     
     success, message, similarity = auth.authenticate_user(username, password, timings)
     
@@ -167,603 +486,78 @@ def authenticate():
         session['username'] = username
         session.permanent = True
     
-    return jsonify({
+    return ojsonify({
         'success': success, 
         'message': message,
         'similarity': round(similarity * 100, 1)
     })
 
+@app.route('/api/authenticate_batch', methods=['POST'])
+def authenticate_batch():
+    # Body: [[username, password, timings], ...]; no session is created
+    data = request_data(list)
+    if not all(is_attempt(item) for item in data):
+        abort(400)
+    
+    if len(data) > MAX_BATCH_SIZE:
+        return ojsonify({'success': False, 'message': 'Too many attempts'}, 400)
+    if any(len(timings) > MAX_TIMINGS for _, _, timings in data):
+        return ojsonify({'success': False, 'message': 'Too many timings'}, 400)
+    
+    results = [None] * len(data)
+    indices = []
+    attempts = []
+    for i, (username, password, timings) in enumerate(data):
+        if not username or not password:
+            results[i] = (False, 'Username and password required', 0)
+        else:
+            indices.append(i)
+            attempts.append((username, password, timings))
+    
+    for i, result in zip(indices, auth.authenticate_batch(attempts)):
+        results[i] = result
+    
+    return ojsonify({'results': [
+        {'success': success, 'message': message, 'similarity': round(similarity * 100, 1)}
+        for success, message, similarity in results
+    ]})
+
 @app.route('/api/users', methods=['GET'])
 def list_users():
     users = auth.list_users()
-    return jsonify({'users': users})
+    return ojsonify({'users': users})
 
 @app.route('/api/delete', methods=['POST'])
 def delete_user():
-    data = request.json
+    data = request_data()
     username = data.get('username')
     
     if not username:
-        return jsonify({'success': False, 'message': 'Username required'})
+        return ojsonify({'success': False, 'message': 'Username required'})
+    if not isinstance(username, str):
+        abort(400)
     
     success = auth.delete_user(username)
     message = 'User deleted' if success else 'User not found'
-    return jsonify({'success': success, 'message': message})
+    return ojsonify({'success': success, 'message': message})
 
 @app.route('/api/logout', methods=['POST'])
 def logout():
     session.pop('username', None)
-    return jsonify({'success': True})
+    return ojsonify({'success': True})
 
 @app.route('/api/session', methods=['GET'])
 def get_session():
     username = session.get('username')
-    return jsonify({'logged_in': username is not None, 'username': username})
+    return ojsonify({'logged_in': username is not None, 'username': username})
 
 if __name__ == '__main__':
-    # Create templates directory if it doesn't exist
-    os.makedirs('templates', exist_ok=True)
-    
-    # Create HTML template
-    html_content = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Keystroke Dynamics Authentication</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            padding: 20px;
-        }
-        
-        .container {
-            background: white;
-            border-radius: 20px;
-            padding: 40px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            max-width: 500px;
-            width: 100%;
-        }
-        
-        h1 {
-            color: #667eea;
-            text-align: center;
-            margin-bottom: 10px;
-            font-size: 28px;
-        }
-        
-        .subtitle {
-            text-align: center;
-            color: #666;
-            margin-bottom: 30px;
-            font-size: 14px;
-        }
-        
-        .tabs {
-            display: flex;
-            gap: 10px;
-            margin-bottom: 30px;
-        }
-        
-        .tab {
-            flex: 1;
-            padding: 12px;
-            background: #f0f0f0;
-            border: none;
-            border-radius: 10px;
-            cursor: pointer;
-            font-size: 14px;
-            font-weight: 600;
-            transition: all 0.3s;
-        }
-        
-        .tab.active {
-            background: #667eea;
-            color: white;
-        }
-        
-        .tab-content {
-            display: none;
-        }
-        
-        .tab-content.active {
-            display: block;
-        }
-        
-        .form-group {
-            margin-bottom: 20px;
-        }
-        
-        label {
-            display: block;
-            margin-bottom: 8px;
-            color: #333;
-            font-weight: 600;
-            font-size: 14px;
-        }
-        
-        input {
-            width: 100%;
-            padding: 12px;
-            border: 2px solid #e0e0e0;
-            border-radius: 10px;
-            font-size: 14px;
-            transition: border-color 0.3s;
-        }
-        
-        input:focus {
-            outline: none;
-            border-color: #667eea;
-        }
-        
-        button {
-            width: 100%;
-            padding: 14px;
-            background: #667eea;
-            color: white;
-            border: none;
-            border-radius: 10px;
-            font-size: 16px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: background 0.3s;
-        }
-        
-        button:hover {
-            background: #5568d3;
-        }
-        
-        button:disabled {
-            background: #ccc;
-            cursor: not-allowed;
-        }
-        
-        .message {
-            padding: 12px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            text-align: center;
-            font-size: 14px;
-        }
-        
-        .success {
-            background: #d4edda;
-            color: #155724;
-            border: 1px solid #c3e6cb;
-        }
-        
-        .error {
-            background: #f8d7da;
-            color: #721c24;
-            border: 1px solid #f5c6cb;
-        }
-        
-        .info {
-            background: #d1ecf1;
-            color: #0c5460;
-            border: 1px solid #bee5eb;
-        }
-        
-        .enrollment-progress {
-            margin-bottom: 20px;
-        }
-        
-        .progress-step {
-            padding: 10px;
-            background: #f8f9fa;
-            border-radius: 8px;
-            margin-bottom: 10px;
-            font-size: 14px;
-        }
-        
-        .progress-step.completed {
-            background: #d4edda;
-            color: #155724;
-        }
-        
-        .progress-step.active {
-            background: #fff3cd;
-            color: #856404;
-        }
-        
-        .user-list {
-            max-height: 200px;
-            overflow-y: auto;
-            margin-bottom: 20px;
-        }
-        
-        .user-item {
-            padding: 12px;
-            background: #f8f9fa;
-            border-radius: 8px;
-            margin-bottom: 10px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .delete-btn {
-            padding: 6px 12px;
-            background: #dc3545;
-            color: white;
-            border: none;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 12px;
-        }
-        
-        .delete-btn:hover {
-            background: #c82333;
-        }
-        
-        .similarity-score {
-            margin-top: 15px;
-            padding: 12px;
-            background: #f8f9fa;
-            border-radius: 8px;
-            text-align: center;
-        }
-        
-        .similarity-bar {
-            width: 100%;
-            height: 30px;
-            background: #e0e0e0;
-            border-radius: 15px;
-            overflow: hidden;
-            margin-top: 10px;
-        }
-        
-        .similarity-fill {
-            height: 100%;
-            background: linear-gradient(90deg, #28a745, #20c997);
-            transition: width 0.5s ease;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-weight: bold;
-        }
-        
-        .logged-in-user {
-            text-align: center;
-            padding: 15px;
-            background: #d4edda;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }
-        
-        .logout-btn {
-            margin-top: 10px;
-            background: #6c757d;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🔐 Keystroke Authentication</h1>
-        <p class="subtitle">Biometric security using typing patterns</p>
-        
-        <div id="loggedInSection" style="display: none;">
-            <div class="logged-in-user">
-                <strong>Logged in as: <span id="currentUser"></span></strong>
-                <button class="logout-btn" onclick="logout()">Logout</button>
-            </div>
-        </div>
-        
-        <div class="tabs">
-            <button class="tab active" onclick="switchTab('login')">Login</button>
-            <button class="tab" onclick="switchTab('enroll')">Enroll</button>
-            <button class="tab" onclick="switchTab('manage')">Manage</button>
-        </div>
-        
-        <div id="messageBox"></div>
-        
-        <!-- Login Tab -->
-        <div id="login" class="tab-content active">
-            <form onsubmit="login(event)">
-                <div class="form-group">
-                    <label>Username</label>
-                    <input type="text" id="loginUsername" required>
-                </div>
-                <div class="form-group">
-                    <label>Password</label>
-                    <input type="password" id="loginPassword" required>
-                </div>
-                <button type="submit">Authenticate</button>
-            </form>
-            <div id="loginSimilarity"></div>
-        </div>
-        
-        <!-- Enroll Tab -->
-        <div id="enroll" class="tab-content">
-            <div class="enrollment-progress" id="enrollProgress"></div>
-            <form onsubmit="handleEnrollSubmit(event)">
-                <div class="form-group">
-                    <label>Username</label>
-                    <input type="text" id="enrollUsername" required>
-                </div>
-                <div class="form-group">
-                    <label>Password (Sample <span id="sampleNum">1</span>/3)</label>
-                    <input type="password" id="enrollPassword" required>
-                </div>
-                <button type="submit" id="enrollBtn">Submit Sample</button>
-            </form>
-        </div>
-        
-        <!-- Manage Tab -->
-        <div id="manage" class="tab-content">
-            <h3 style="margin-bottom: 15px; color: #333;">Registered Users</h3>
-            <div class="user-list" id="userList"></div>
-            <button onclick="loadUsers()">Refresh List</button>
-        </div>
-    </div>
-    
-    <script>
-        let keystrokeTimes = [];
-        let lastKeyTime = 0;
-        let enrollmentData = {
-            username: '',
-            password: '',
-            samples: [],
-            currentSample: 1
-        };
-        
-        // Check session on load
-        checkSession();
-        
-        function checkSession() {
-            fetch('/api/session')
-                .then(r => r.json())
-                .then(data => {
-                    if (data.logged_in) {
-                        document.getElementById('loggedInSection').style.display = 'block';
-                        document.getElementById('currentUser').textContent = data.username;
-                    }
-                });
-        }
-        
-        function logout() {
-            fetch('/api/logout', {method: 'POST'})
-                .then(() => {
-                    document.getElementById('loggedInSection').style.display = 'none';
-                    showMessage('Logged out successfully', 'info');
-                });
-        }
-        
-        function switchTab(tabName) {
-            document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
-            document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
-            
-            event.target.classList.add('active');
-            document.getElementById(tabName).classList.add('active');
-            
-            clearMessage();
-            
-            if (tabName === 'manage') {
-                loadUsers();
-            } else if (tabName === 'enroll') {
-                resetEnrollment();
-            }
-        }
-        
-        function captureKeystroke(inputId) {
-            const input = document.getElementById(inputId);
-            
-            input.addEventListener('keydown', (e) => {
-                if (e.key.length === 1 || e.key === 'Backspace') {
-                    const currentTime = performance.now();
-                    if (lastKeyTime > 0) {
-                        const interval = (currentTime - lastKeyTime) / 1000;
-                        keystrokeTimes.push(interval);
-                    }
-                    lastKeyTime = currentTime;
-                }
-            });
-            
-            input.addEventListener('focus', () => {
-                keystrokeTimes = [];
-                lastKeyTime = 0;
-            });
-        }
-        
-        captureKeystroke('loginPassword');
-        captureKeystroke('enrollPassword');
-        
-        function login(e) {
-            e.preventDefault();
-            
-            const username = document.getElementById('loginUsername').value;
-            const password = document.getElementById('loginPassword').value;
-            
-            fetch('/api/authenticate', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({
-                    username: username,
-                    password: password,
-                    timings: keystrokeTimes
-                })
-            })
-            .then(r => r.json())
-            .then(data => {
-                if (data.success) {
-                    showMessage('✅ ' + data.message, 'success');
-                    displaySimilarity(data.similarity);
-                    checkSession();
-                } else {
-                    showMessage('❌ ' + data.message, 'error');
-                    if (data.similarity > 0) {
-                        displaySimilarity(data.similarity);
-                    }
-                }
-                
-                document.getElementById('loginPassword').value = '';
-                keystrokeTimes = [];
-            });
-        }
-        
-        function displaySimilarity(score) {
-            const html = `
-                <div class="similarity-score">
-                    <strong>Keystroke Pattern Similarity</strong>
-                    <div class="similarity-bar">
-                        <div class="similarity-fill" style="width: ${score}%">${score}%</div>
-                    </div>
-                </div>
-            `;
-            document.getElementById('loginSimilarity').innerHTML = html;
-        }
-        
-        function handleEnrollSubmit(e) {
-            e.preventDefault();
-            
-            const username = document.getElementById('enrollUsername').value;
-            const password = document.getElementById('enrollPassword').value;
-            
-            if (enrollmentData.currentSample === 1) {
-                enrollmentData.username = username;
-                enrollmentData.password = password;
-            } else if (password !== enrollmentData.password) {
-                showMessage('❌ Password mismatch! Please start over.', 'error');
-                resetEnrollment();
-                return;
-            }
-            
-            enrollmentData.samples.push([...keystrokeTimes]);
-            updateEnrollProgress();
-            
-            if (enrollmentData.currentSample >= 3) {
-                completeEnrollment();
-            } else {
-                enrollmentData.currentSample++;
-                document.getElementById('sampleNum').textContent = enrollmentData.currentSample;
-                document.getElementById('enrollPassword').value = '';
-                keystrokeTimes = [];
-            }
-        }
-        
-        function updateEnrollProgress() {
-            let html = '';
-            for (let i = 1; i <= 3; i++) {
-                let className = 'progress-step';
-                let status = '';
-                if (i < enrollmentData.currentSample) {
-                    className += ' completed';
-                    status = '✅ Completed';
-                } else if (i === enrollmentData.currentSample) {
-                    className += ' active';
-                    status = '⏳ In Progress';
-                } else {
-                    status = '⭕ Pending';
-                }
-                html += `<div class="${className}">Sample ${i}: ${status}</div>`;
-            }
-            document.getElementById('enrollProgress').innerHTML = html;
-        }
-        
-        function completeEnrollment() {
-            fetch('/api/enroll', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({
-                    username: enrollmentData.username,
-                    password: enrollmentData.password,
-                    timings: enrollmentData.samples
-                })
-            })
-            .then(r => r.json())
-            .then(data => {
-                if (data.success) {
-                    showMessage('✅ ' + data.message, 'success');
-                    resetEnrollment();
-                } else {
-                    showMessage('❌ ' + data.message, 'error');
-                }
-            });
-        }
-        
-        function resetEnrollment() {
-            enrollmentData = {
-                username: '',
-                password: '',
-                samples: [],
-                currentSample: 1
-            };
-            document.getElementById('enrollUsername').value = '';
-            document.getElementById('enrollPassword').value = '';
-            document.getElementById('sampleNum').textContent = '1';
-            document.getElementById('enrollProgress').innerHTML = '';
-            keystrokeTimes = [];
-        }
-        
-        function loadUsers() {
-            fetch('/api/users')
-                .then(r => r.json())
-                .then(data => {
-                    const listDiv = document.getElementById('userList');
-                    if (data.users.length === 0) {
-                        listDiv.innerHTML = '<p style="text-align: center; color: #666;">No users enrolled</p>';
-                    } else {
-                        listDiv.innerHTML = data.users.map(user => `
-                            <div class="user-item">
-                                <span><strong>${user}</strong></span>
-                                <button class="delete-btn" onclick="deleteUser('${user}')">Delete</button>
-                            </div>
-                        `).join('');
-                    }
-                });
-        }
-        
-        function deleteUser(username) {
-            if (confirm(`Delete user "${username}"?`)) {
-                fetch('/api/delete', {
-                    method: 'POST',
-                    headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify({username: username})
-                })
-                .then(r => r.json())
-                .then(data => {
-                    showMessage(data.success ? '✅ User deleted' : '❌ ' + data.message, 
-                               data.success ? 'success' : 'error');
-                    loadUsers();
-                });
-            }
-        }
-        
-        function showMessage(text, type) {
-            const box = document.getElementById('messageBox');
-            box.innerHTML = `<div class="message ${type}">${text}</div>`;
-        }
-        
-        function clearMessage() {
-            document.getElementById('messageBox').innerHTML = '';
-        }
-    </script>
-</body>
-</html>'''
-    
-    # Write HTML template
-    with open('templates/index.html', 'w') as f:
-        f.write(html_content)
-    
-    print("🚀 Starting Keystroke Dynamics Web Application")
-    print("📍 Open your browser and navigate to: http://127.0.0.1:5000")
+    print("🚀 Keystroke Dynamics Web Application")
+    print("\n▶️  Serve it with a production WSGI server, e.g.:")
+    print("   gunicorn -w 4 -k gthread --threads 4 -b 0.0.0.0:5000 wsgi:app")
+    print("📍 Then open your browser and navigate to: http://127.0.0.1:5000")
     print("\n✨ Features:")
     print("   - Real-time keystroke timing capture")
     print("   - Visual similarity scoring")
     print("   - User management interface")
     print("   - Session management\n")
-    
-    app.run(debug=True, host='0.0.0.0', port=5000)
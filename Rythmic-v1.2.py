@@ -1,35 +1,147 @@
+import atexit
 import time
+import math
 import getpass
-import statistics
-import json
+import hashlib
+import hmac
 import os
 from collections import defaultdict
 
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _mean_var(xs):
+    """Mean and sample variance in one pass (Welford), without statistics' Fractions"""
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in xs:
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+    return mean, (m2 / (n - 1) if n > 1 else 0.0)
+
+
+def _build_profile_comparator(weights):
+    """Generate a straight-line profile distance function for a fixed set of weights.
+
+    The returned function takes (profile1, profile2, max_diff) and returns
+    the weighted difference, or None once it exceeds max_diff.
+    """
+    lines = ['def compare(p1, p2, max_diff):', '    t = 0.0']
+    for key, weight in weights.items():
+        lines += [
+            f'    a = p1[{key!r}]',
+            f'    b = p2[{key!r}]',
+            '    if a == 0 or b == 0:',
+            '        if a != b:',
+            '            t += 1',
+            '            if t > max_diff:',
+            '                return None',
+            '    else:',
+            f'        t += abs(a - b) / max(a, b) * {weight!r}',
+            '        if t > max_diff:',
+            '            return None',
+        ]
+    lines.append('    return t')
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['compare']
+
+
+# Heaviest metrics first so a failing comparison exits early
+_compare_profiles = _build_profile_comparator(
+    {'mean': 0.3, 'total_time': 0.3, 'median': 0.2, 'stdev': 0.2}
+)
+
 
 class KeystrokeAuthenticator:
+    __slots__ = ('profile_file', 'profiles', '_encoded', '_dirty')
+
+    # One large buffer so the profile file is moved in a few syscalls
+    IO_BUFFER_SIZE = 1 << 20
+
     def __init__(self, profile_file='keystroke_profile.json'):
         self.profile_file = profile_file
         self.profiles = self.load_profiles()
+        # Per-user encoded JSON kept from the last save; only changed users are re-encoded
+        self._encoded = {}
+        self._dirty = False
+        atexit.register(self.save_profiles)
 
     def load_profiles(self):
         """Load existing keystroke profiles from file"""
-        if os.path.exists(self.profile_file):
-            with open(self.profile_file, 'r') as f:
-                return json.load(f)
-        return {}
+        try:
+            with open(self.profile_file, 'rb',
+                      buffering=self.IO_BUFFER_SIZE) as f:
+                return _loads(f.read())
+        except FileNotFoundError:
+            return {}
+
+    def mark_dirty(self, username):
+        """Record that a user's profile changed and must be re-encoded"""
+        self._encoded.pop(username, None)
+        self._dirty = True
 
     def save_profiles(self):
-        """Save keystroke profiles to file"""
-        with open(self.profile_file, 'w') as f:
-            json.dump(self.profiles, f, indent=2)
+        """Save keystroke profiles to file if anything changed"""
+        if not self._dirty:
+            return
+
+        parts = []
+        for username, profile in self.profiles.items():
+            encoded = self._encoded.get(username)
+            if encoded is None:
+                encoded = _dumps(profile)
+                self._encoded[username] = encoded
+            parts.append(_dumps(username) + b':' + encoded)
+
+        # Write to a temp file and swap it in so a crash never leaves a partial file
+        tmp_file = self.profile_file + '.tmp'
+        with open(tmp_file, 'wb', buffering=self.IO_BUFFER_SIZE) as f:
+            f.write(b'{' + b','.join(parts) + b'}')
+        os.replace(tmp_file, self.profile_file)
+        self._dirty = False
+
+    @staticmethod
+    def hash_password(password, salt=None):
+        """Derive an scrypt hash of the password; returns (salt_hex, hash_hex)"""
+        if salt is None:
+            salt = os.urandom(16)
+        digest = hashlib.scrypt(password.encode(), salt=salt, n=16384, r=8, p=1, dklen=32)
+        return salt.hex(), digest.hex()
+
+    def verify_password(self, password, profile):
+        """Check a password against a stored profile in constant time"""
+        if 'password_hash' not in profile:
+            # Profiles saved by earlier versions hold the plaintext
+            return hmac.compare_digest(password.encode(), profile['password'].encode())
+        _, digest = self.hash_password(password, bytes.fromhex(profile['password_salt']))
+        return hmac.compare_digest(digest, profile['password_hash'])
 
     @staticmethod
-    def capture_keystroke_timing(prompt="Enter password: "):
-        """Capture password with keystroke timing data"""
+    def capture_keystroke_timing(prompt="Enter password: ", expected_len=0):
+        """Capture password with keystroke timing data (intervals in integer nanoseconds).
+
+        expected_len pre-sizes the timings list when the password length is
+        already known, so capture does not grow it while in raw mode.
+        """
         print(prompt, end='', flush=True)
-        password = ""
-        timings = []
-        last_time = time.perf_counter()
+        pw_chars = []
+        # timings[:idx] holds the intervals of the characters kept so far
+        timings = [0] * expected_len
+        idx = 0
+        last_time = time.perf_counter_ns()
 
         # Platform-specific keystroke capture
         try:
@@ -37,21 +149,25 @@ class KeystrokeAuthenticator:
             while True:
                 if msvcrt.kbhit():
                     char = msvcrt.getch()
-                    current_time = time.perf_counter()
+                    current_time = time.perf_counter_ns()
 
                     if char == b'\r':  # Enter key
                         break
                     elif char == b'\x08':  # Backspace
-                        if password:
-                            password = password[:-1]
-                            timings = timings[:-1]
+                        if pw_chars:
+                            pw_chars.pop()
+                            idx -= 1
                             print('\b \b', end='', flush=True)
                     else:
                         try:
                             decoded_char = char.decode('utf-8')
-                            password += decoded_char
+                            pw_chars.append(decoded_char)
                             interval = current_time - last_time
-                            timings.append(interval)
+                            if idx < len(timings):
+                                timings[idx] = interval
+                            else:
+                                timings.append(interval)
+                            idx += 1
                             print('*', end='', flush=True)
                             last_time = current_time
                         except:
@@ -61,72 +177,97 @@ class KeystrokeAuthenticator:
             import sys
             import tty
             import termios
+            import codecs
 
             fd = sys.stdin.fileno()
+            out_fd = sys.stdout.fileno()
             old_settings = termios.tcgetattr(fd)
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
             try:
                 tty.setraw(fd)
-                while True:
-                    char = sys.stdin.read(1)
-                    current_time = time.perf_counter()
-
-                    if char == '\r' or char == '\n':
+                done = False
+                while not done:
+                    # Drain everything available (a paste arrives as one burst)
+                    buf = os.read(fd, 64)
+                    current_time = time.perf_counter_ns()
+                    if not buf:  # EOF
                         break
-                    elif char == '\x7f':  # Backspace
-                        if password:
-                            password = password[:-1]
-                            timings = timings[:-1]
-                            print('\b \b', end='', flush=True)
-                    elif char == '\x03':  # Ctrl+C
-                        raise KeyboardInterrupt
-                    else:
-                        password += char
-                        interval = current_time - last_time
-                        timings.append(interval)
-                        print('*', end='', flush=True)
-                        last_time = current_time
+
+                    echo = []
+                    for char in decoder.decode(buf):
+                        if char == '\r' or char == '\n':
+                            done = True
+                            break
+                        elif char == '\x7f':  # Backspace
+                            if pw_chars:
+                                pw_chars.pop()
+                                idx -= 1
+                                echo.append('\b \b')
+                        elif char == '\x03':  # Ctrl+C
+                            raise KeyboardInterrupt
+                        else:
+                            # Later characters of the same burst get a zero interval
+                            pw_chars.append(char)
+                            interval = current_time - last_time
+                            if idx < len(timings):
+                                timings[idx] = interval
+                            else:
+                                timings.append(interval)
+                            idx += 1
+                            echo.append('*')
+                            last_time = current_time
+
+                    # Echo the whole burst with a single write
+                    if echo:
+                        os.write(out_fd, ''.join(echo).encode())
             finally:
                 termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
         print()  # New line after password entry
-        return password, timings
+        del timings[idx:]
+        return ''.join(pw_chars), timings
 
     @staticmethod
     def calculate_timing_features(timings):
-        """Calculate statistical features from timing data"""
-        if len(timings) < 2:
+        """Calculate statistical features (in seconds) from nanosecond timing data"""
+        n = len(timings)
+        if n < 2:
             return None
 
+        mean, var = _mean_var(timings)
+
+        ordered = sorted(timings)
+        mid = n // 2
+        median = ordered[mid] if n % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+        # Statistics are computed on the raw integers and scaled once
+        ns = 1e-9
         features = {
-            'mean': statistics.mean(timings),
-            'median': statistics.median(timings),
-            'stdev': statistics.stdev(timings) if len(timings) > 1 else 0,
-            'min': min(timings),
-            'max': max(timings),
-            'total_time': sum(timings)
+            'mean': mean * ns,
+            'median': median * ns,
+            'stdev': math.sqrt(var) * ns,
+            'min': ordered[0] * ns,
+            'max': ordered[-1] * ns,
+            'total_time': sum(timings) * ns
         }
         return features
 
     @staticmethod
-    def compare_timing_profiles(profile1, profile2, threshold=0.3):
-        """Compare two timing profiles and return similarity score"""
+    def compare_timing_profiles(profile1, profile2, threshold=0.3, min_similarity=None):
+        """Compare two timing profiles and return similarity score.
+
+        If min_similarity is given, None is returned as soon as the score is
+        known to fall below it, skipping the remaining metrics.
+        """
         if not profile1 or not profile2:
             return 0
 
-        # Calculate percentage differences for each metric
-        diffs = []
-        weights = {'mean': 0.3, 'median': 0.2, 'stdev': 0.2, 'total_time': 0.3}
-
-        for key in weights:
-            if profile1[key] == 0 and profile2[key] == 0:
-                diffs.append(0)
-            elif profile1[key] == 0 or profile2[key] == 0:
-                diffs.append(1)
-            else:
-                diff = abs(profile1[key] - profile2[key]) / max(profile1[key], profile2[key])
-                diffs.append(diff * weights[key])
+        # Accumulate weighted percentage differences for each metric
+        max_diff = 1 - min_similarity if min_similarity is not None else math.inf
+        total_diff = _compare_profiles(profile1, profile2, max_diff)
+        if total_diff is None:
+            return None
 
-        total_diff = sum(diffs)
         similarity = 1 - total_diff
 
         return max(0, similarity)
@@ -141,7 +282,10 @@ class KeystrokeAuthenticator:
         all_timings = []
 
         for i in range(num_samples):
-            pwd, timings = self.capture_keystroke_timing(f"Sample {i + 1}/{num_samples}: ")
+            pwd, timings = self.capture_keystroke_timing(
+                f"Sample {i + 1}/{num_samples}: ",
+                expected_len=len(password) if password is not None else 0
+            )
 
             if password is None:
                 password = pwd
@@ -152,25 +296,25 @@ class KeystrokeAuthenticator:
             all_timings.append(timings)
             time.sleep(0.5)
 
-        # Calculate average profile
+        # Calculate average profile, computing each sample's features once
         avg_features = {}
         feature_keys = ['mean', 'median', 'stdev', 'min', 'max', 'total_time']
+        per_sample = [self.calculate_timing_features(timings) for timings in all_timings]
+        per_sample = [features for features in per_sample if features]
 
-        for key in feature_keys:
-            values = []
-            for timings in all_timings:
-                features = self.calculate_timing_features(timings)
-                if features:
-                    values.append(features[key])
-            if values:
-                avg_features[key] = statistics.mean(values)
+        if per_sample:
+            for key in feature_keys:
+                avg_features[key] = math.fsum(f[key] for f in per_sample) / len(per_sample)
 
         # Store profile
+        salt, digest = self.hash_password(password)
         self.profiles[username] = {
-            'password': password,  # In production, hash this!
+            'password_salt': salt,
+            'password_hash': digest,
             'timing_profile': avg_features,
             'password_length': len(password)
         }
+        self.mark_dirty(username)
 
         self.save_profiles()
         print(f"✅ User '{username}' enrolled successfully!")
@@ -178,35 +322,48 @@ class KeystrokeAuthenticator:
 
     def authenticate_user(self, username):
         """Authenticate a user based on password and keystroke dynamics"""
-        if username not in self.profiles:
+        profile = self.profiles.get(username)
+        if profile is None:
             print(f"❌ User '{username}' not found.")
             return False
 
         print(f"\n=== Authenticating User: {username} ===")
-        password, timings = self.capture_keystroke_timing()
-
-        profile = self.profiles[username]
+        password, timings = self.capture_keystroke_timing(
+            expected_len=profile.get('password_length', 0)
+        )
 
         # Check password
-        if password != profile['password']:
+        if not self.verify_password(password, profile):
             print("❌ Authentication failed: Incorrect password")
             return False
 
+        # Replace a legacy plaintext password now that it is known to be right
+        if 'password_hash' not in profile:
+            del profile['password']
+            profile['password_salt'], profile['password_hash'] = self.hash_password(password)
+            self.mark_dirty(username)
+            self.save_profiles()
+
         # Check keystroke dynamics
         current_features = self.calculate_timing_features(timings)
         if not current_features:
             print("❌ Authentication failed: Insufficient timing data")
             return False
 
+        # Require 60% similarity for authentication; None means the
+        # comparison stopped early because the score was already below it
         similarity = self.compare_timing_profiles(
             profile['timing_profile'],
-            current_features
+            current_features,
+            min_similarity=0.60
         )
 
-        print(f"\n📊 Keystroke Pattern Similarity: {similarity * 100:.1f}%")
+        if similarity is None:
+            print("\n📊 Keystroke Pattern Similarity: below 60%")
+        else:
+            print(f"\n📊 Keystroke Pattern Similarity: {similarity * 100:.1f}%")
 
-        # Require 60% similarity for authentication
-        if similarity >= 0.60:
+        if similarity is not None and similarity >= 0.60:
             print("✅ Authentication successful!")
             print(f"   Password: Correct ✓")
             print(f"   Typing Pattern: Verified ✓")
@@ -218,8 +375,8 @@ class KeystrokeAuthenticator:
 
     def delete_user(self, username):
         """Delete a user profile"""
-        if username in self.profiles:
-            del self.profiles[username]
+        if self.profiles.pop(username, None) is not None:
+            self.mark_dirty(username)
             self.save_profiles()
             print(f"✅ User '{username}' deleted.")
         else:
@@ -0,0 +1,19 @@
+"""WSGI entry point for the keystroke dynamics web app.
+
+The app script's file name is not a valid module name, so it is loaded
+by path here and its Flask ``app`` is re-exported for the WSGI server:
+
+    gunicorn -w 4 -k gthread --threads 4 -b 0.0.0.0:5000 wsgi:app
+"""
+import importlib.util
+import os
+import sys
+
+_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Rythmic-V-1.4.py')
+_spec = importlib.util.spec_from_file_location('rythmic', _path)
+rythmic = importlib.util.module_from_spec(_spec)
+# Registered before executing so Flask can resolve the app's root path
+sys.modules['rythmic'] = rythmic
+_spec.loader.exec_module(rythmic)
+
+app = rythmic.app